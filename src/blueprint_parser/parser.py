@@ -1,12 +1,140 @@
+import hashlib
+import json
+import os
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
 from pathlib import Path
 from typing import Any
 
 import yaml
-from jinja2 import Environment, StrictUndefined, TemplateError
+from jinja2 import (
+    BytecodeCache,
+    Environment,
+    FileSystemBytecodeCache,
+    FileSystemLoader,
+    StrictUndefined,
+    TemplateError,
+    TemplateNotFound,
+)
 from pydantic import ValidationError
 
 from .schema import BlueprintModel, RoutineModel
 
+# Prefer the libyaml-backed loader (same safety guarantees, much faster);
+# fall back to the pure-Python one when PyYAML was built without libyaml.
+try:
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:
+    from yaml import SafeLoader as _SafeLoader
+
+# Matches the opening of any Jinja construct: {{ expression }},
+# {% statement %}, or {# comment #}.
+_JINJA_RE = re.compile(r"\{[{%#]")
+
+# Mixed into every plan snapshot key. Bump this whenever the execution
+# plan shape changes, so snapshots written by older versions miss
+# instead of replaying in the old format.
+_PLAN_FORMAT_VERSION = b"loom-plan-v1"
+
+
+def _read_bytes(path: Path) -> bytes:
+    """
+    Read a file's contents with one sized os.read against the raw fd.
+
+    fstat gives the exact size, so the read allocates a single
+    right-sized buffer — no BufferedReader/file-object layering and no
+    growth-and-copy cycles.
+    """
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        size = os.fstat(fd).st_size
+        return os.read(fd, size)
+    finally:
+        os.close(fd)
+
+
+def _intern_keys(obj: Any) -> Any:
+    """
+    Recursively intern the string keys of a parsed YAML structure.
+
+    Every step dict repeats the same handful of keys (name, uses, with,
+    ensure, ...), but libyaml allocates a fresh str per occurrence.
+    Interning collapses them to shared objects, cutting memory on large
+    blueprints and letting dict lookups take the identity fast path.
+    """
+    if isinstance(obj, dict):
+        return {
+            sys.intern(key) if isinstance(key, str) else key: _intern_keys(value)
+            for key, value in obj.items()
+        }
+    if isinstance(obj, list):
+        return [_intern_keys(item) for item in obj]
+    return obj
+
+
+@lru_cache(maxsize=256)
+def _load_yaml_raw(path_str: str, mtime_ns: int, size: int) -> Any:
+    """
+    Parse a YAML file, memoized process-wide by path, mtime, and size.
+
+    The mtime and size arguments exist purely to key the cache: an edited
+    file produces a new key and is re-parsed, while unchanged files hit
+    the cache across all BlueprintParser instances.
+    """
+    # Feeding the whole buffer to libyaml beats streaming through a
+    # TextIOWrapper; the bytes go straight to libyaml, which decodes
+    # UTF-8 internally in C.
+    return _intern_keys(yaml.load(_read_bytes(Path(path_str)), Loader=_SafeLoader))
+
+
+def _user_cache_dir() -> Path:
+    """Return loom's per-user cache directory, honoring XDG_CACHE_HOME."""
+    xdg_cache_home = os.environ.get("XDG_CACHE_HOME")
+    cache_base = Path(xdg_cache_home) if xdg_cache_home else Path.home() / ".cache"
+    return cache_base / "loom"
+
+
+def _bytecode_cache() -> BytecodeCache | None:
+    """
+    Build a filesystem bytecode cache for compiled Jinja templates.
+
+    Persisting template bytecode under the user cache directory lets
+    subsequent CLI runs skip Jinja compilation entirely for unchanged
+    task files. Returns None if the cache directory cannot be created
+    (e.g. read-only home), in which case templates compile as before.
+    """
+    cache_dir = _user_cache_dir() / "jinja"
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+    except OSError:
+        return None
+    return FileSystemBytecodeCache(str(cache_dir))
+
+
+@lru_cache(maxsize=32)
+def _get_env(tasks_dir: str) -> Environment:
+    """
+    Build (or reuse) the Jinja environment for a tasks directory.
+
+    Environment construction initializes lexer tables and default
+    filters, and each environment carries its own compiled-template
+    cache, so parsers pointed at the same project share one instance
+    instead of rebuilding it per BlueprintParser.
+    """
+    # auto_reload stays at its default (True): the loader re-stats a
+    # cached template before serving it, so an edited task file is
+    # recompiled instead of silently rendering stale content. That one
+    # stat per render is what every other cache here keys on (mtime) and
+    # keeps long-running processes correct.
+    return Environment(
+        loader=FileSystemLoader(tasks_dir),
+        undefined=StrictUndefined,
+        cache_size=400,
+        bytecode_cache=_bytecode_cache(),
+    )
+
 
 class BlueprintParser:
     """Parser for blueprint YAML files with Jinja2 variable templating support."""
@@ -23,7 +151,78 @@ class BlueprintParser:
 
         # Configure Jinja2 environment
         # StrictUndefined ensures we crash if a variable is missing (Safety Feature)
-        self.jinja_env = Environment(undefined=StrictUndefined)
+        # The FileSystemLoader lets Jinja load, compile, and cache task
+        # templates by name, so repeated references skip the compile step.
+        # The environment is shared across parsers with the same tasks
+        # directory and is never mutated per parse, so concurrent parses
+        # cannot observe each other's vars.
+        self.jinja_env = _get_env(str(self.tasks_dir))
+
+        # Task Paths are constructed once per filename; Path joining does
+        # string parsing on every call, which adds up over repeated
+        # parses of the same run list.
+        self._task_paths: dict[str, Path] = {}
+
+        # Validated models memoized per path, tagged with the mtime they
+        # were validated at. Once a file passes full Pydantic validation,
+        # re-parsing it unchanged skips the validator traversal entirely;
+        # an edit replaces the file's entry instead of stranding the old
+        # one, so the cache stays bounded by the number of distinct
+        # files. Only context-independent results (blueprints,
+        # untemplated tasks) are eligible.
+        self._model_cache: dict[Path, tuple[int, BlueprintModel | RoutineModel]] = {}
+
+    def _load_yaml_cached(self, path: Path) -> Any:
+        """
+        Load and parse a YAML file through the process-wide cache.
+
+        The cache key includes mtime and size, so an edited file is
+        re-parsed while unchanged files hit the cache — even across
+        parser instances. The returned structure is shared with the
+        cache and must be treated as read-only; both consumers feed it
+        straight into Pydantic validation, which copies the values it
+        keeps.
+
+        Args:
+            path: Path to the YAML file to load
+
+        Returns:
+            The parsed YAML document
+
+        Raises:
+            FileNotFoundError: If the file does not exist
+            yaml.YAMLError: If the file is not valid YAML
+        """
+        st = path.stat()
+        return _load_yaml_raw(str(path), st.st_mtime_ns, st.st_size)
+
+    def _plan_cache_path(
+        self, blueprint_path: Path, blueprint: BlueprintModel
+    ) -> tuple[Path, dict[str, bytes]] | None:
+        """
+        Content-addressed cache location for a blueprint's execution plan.
+
+        The plan is a pure function of the blueprint file and the task
+        files it references (the vars live in the blueprint itself), so
+        hashing those contents yields a key that self-invalidates on any
+        edit. Also returns the per-task digests that went into the key,
+        so the snapshot write can check it is filing a plan built from
+        exactly those bytes. Returns None when a referenced file cannot
+        be read; the normal parse path then reports the error.
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(_PLAN_FORMAT_VERSION)
+        task_digests: dict[str, bytes] = {}
+        try:
+            digest.update(_read_bytes(blueprint_path))
+            for task_file in dict.fromkeys(task_ref.file for task_ref in blueprint.run):
+                task_bytes = _read_bytes(self.tasks_dir / task_file)
+                task_digests[task_file] = hashlib.blake2b(task_bytes, digest_size=16).digest()
+                digest.update(task_file.encode("utf-8"))
+                digest.update(task_bytes)
+        except OSError:
+            return None
+        return _user_cache_dir() / "plans" / f"{digest.hexdigest()}.json", task_digests
 
     def parse_blueprint(self, filename: str) -> dict[str, Any]:
         """
@@ -44,8 +243,7 @@ class BlueprintParser:
 
         # 1. Load the raw Blueprint YAML
         try:
-            with open(blueprint_path, "r", encoding="utf-8") as f:
-                raw_data = yaml.safe_load(f)
+            raw_data = self._load_yaml_cached(blueprint_path)
         except FileNotFoundError:
             raise FileNotFoundError(f"Blueprint not found at {blueprint_path}")  # noqa: B904
         except yaml.YAMLError as e:
@@ -55,84 +253,244 @@ class BlueprintParser:
             raise ValueError(f"Blueprint file {filename} is empty")
 
         # 2. Validate Blueprint against Schema
-        try:
-            blueprint = BlueprintModel(**raw_data)
-        except ValidationError as e:
-            raise ValueError(f"Blueprint Grammar Error:\n{e}")  # noqa: B904
+        # Files that already passed validation skip the validator re-run
+        # as long as they are unchanged on disk.
+        blueprint_mtime_ns = blueprint_path.stat().st_mtime_ns
+        cached_entry = self._model_cache.get(blueprint_path)
+
+        if (
+            cached_entry is not None
+            and cached_entry[0] == blueprint_mtime_ns
+            and isinstance(cached_entry[1], BlueprintModel)
+        ):
+            blueprint = cached_entry[1]
+        else:
+            try:
+                blueprint = BlueprintModel(**raw_data)
+            except ValidationError as e:
+                raise ValueError(f"Blueprint Grammar Error:\n{e}")  # noqa: B904
+            self._model_cache[blueprint_path] = (blueprint_mtime_ns, blueprint)
+
+        # 3. Check the on-disk plan cache
+        # A snapshot keyed on the blueprint + task file contents replays
+        # the whole plan from one JSON read, skipping render/parse/
+        # validate entirely. Best-effort: any cache problem falls through
+        # to a normal parse.
+        plan_cache_path: Path | None = None
+        keyed_task_digests: dict[str, bytes] = {}
+        plan_cache = self._plan_cache_path(blueprint_path, blueprint)
+        if plan_cache is not None:
+            plan_cache_path, keyed_task_digests = plan_cache
+            try:
+                return json.loads(plan_cache_path.read_bytes())
+            except (OSError, ValueError):
+                pass
+
+        # 4. Process the Run List
+        global_vars = blueprint.vars or {}
+
+        # Conditions that can be decided from the blueprint vars alone are
+        # evaluated up front: a statically false `when` means the task is
+        # never executed, so its file is not loaded, rendered, or
+        # validated at all. Any condition that cannot be decided here —
+        # unknown runtime facts (StrictUndefined), type errors in the
+        # expression, anything else — is deferred to the executor as
+        # before; static evaluation is an optimization and must never
+        # introduce new parse failures.
+        def statically_false(when: str | None) -> bool:
+            if when is None:
+                return False
+            try:
+                expression = self.jinja_env.compile_expression(when)
+                return not expression(vars=global_vars)
+            except Exception:
+                return False
 
-        # 3. Create the Execution Plan
-        # We transform the Pydantic model into a clean dictionary for the executor
+        ref_skipped = [statically_false(task_ref.when) for task_ref in blueprint.run]
+
+        # The global vars are constant for the duration of one parse, so a
+        # task file referenced several times (e.g. under different `when`
+        # conditions) only needs to load, render, and dump once.
+        unique_files = list(
+            dict.fromkeys(
+                task_ref.file
+                for task_ref, skipped in zip(blueprint.run, ref_skipped, strict=True)
+                if not skipped
+            )
+        )
+
+        # Task files are independent of each other, so load them in
+        # parallel: disk reads overlap and libyaml releases the GIL
+        # while tokenizing. executor.map preserves the file order.
+        load_routine = partial(self._load_and_render_routine, context=global_vars)
+
+        if len(unique_files) > 1:
+            max_workers = min(8, len(unique_files))
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                loaded = list(executor.map(load_routine, unique_files))
+        else:
+            loaded = [load_routine(filename) for filename in unique_files]
+
+        steps_by_file = {
+            filename: routine.model_dump(by_alias=True)["steps"]
+            for filename, (routine, _) in zip(unique_files, loaded, strict=True)
+        }
+        used_digests = {
+            filename: digest for filename, (_, digest) in zip(unique_files, loaded, strict=True)
+        }
+
+        # 5. Create the Execution Plan
+        # We transform the Pydantic model into a clean dictionary for the
+        # executor, building the task list in a single comprehension pass.
         execution_plan = {
             "meta": {
                 "name": blueprint.name,
                 "target": blueprint.target,
                 "user": blueprint.user,
             },
-            "tasks": [],
-        }
-
-        # 4. Process the Run List
-        print(f"[*] Parsing Blueprint: {blueprint.name}")
-
-        for task_ref in blueprint.run:
-            # We pass the global vars down to the routine loader
-            routine = self._load_and_render_routine(task_ref.file, blueprint.vars or {})
-
-            execution_plan["tasks"].append(
+            "tasks": [
                 {
                     "source_file": task_ref.file,
                     "condition": task_ref.when,
-                    "steps": [step.model_dump(by_alias=True) for step in routine.steps],
+                    # Each reference gets its own list (the step dicts are
+                    # still shared): a file rendered once can appear under
+                    # several run entries, and a snapshot replay would
+                    # de-alias them anyway, so in-place mutation by the
+                    # executor must not leak between sibling tasks.
+                    "steps": [] if skipped else list(steps_by_file[task_ref.file]),
                 }
-            )
+                for task_ref, skipped in zip(blueprint.run, ref_skipped, strict=True)
+            ],
+        }
+
+        # 6. Snapshot the plan for future runs (best-effort)
+        # The key was hashed from the on-disk bytes at step 3. Only write
+        # the snapshot when every routine was provably built from those
+        # same bytes and the blueprint is unchanged since step 2 —
+        # otherwise a plan rendered from stale content would be filed
+        # under the new key, poisoning the cache for every later run.
+        # Statically skipped files contribute no steps, so their content
+        # needs no check. Missed writes just mean a re-parse next run.
+        if plan_cache_path is not None and all(
+            used_digests[task_file] == keyed_task_digests.get(task_file)
+            for task_file in used_digests
+        ):
+            try:
+                if blueprint_path.stat().st_mtime_ns == blueprint_mtime_ns:
+                    plan_cache_path.parent.mkdir(parents=True, exist_ok=True)
+                    # Write-then-rename so a concurrent reader never sees
+                    # a torn snapshot; the pid keeps writers from
+                    # clobbering each other's temp file.
+                    tmp_path = plan_cache_path.with_name(
+                        f".{plan_cache_path.name}.{os.getpid()}.tmp"
+                    )
+                    tmp_path.write_text(json.dumps(execution_plan))
+                    os.replace(tmp_path, plan_cache_path)
+            except (OSError, TypeError, ValueError):
+                pass
 
         return execution_plan
 
-    def _load_and_render_routine(self, filename: str, context: dict[str, Any]) -> RoutineModel:
+    def _load_and_render_routine(
+        self, filename: str, context: dict[str, Any]
+    ) -> tuple[RoutineModel, bytes | None]:
         """
         Loads a task file, renders variables using Jinja2, and then parses it.
 
         Args:
             filename: Name of the task file to load
-            context: Dictionary of variables to use for Jinja2 rendering
+            context: Blueprint vars to expose to the template as `vars`
 
         Returns:
-            Validated RoutineModel instance
+            The validated RoutineModel, paired with a digest of the raw
+            bytes the routine was built from — or None when that cannot
+            be established (the file changed while being rendered)
 
         Raises:
             FileNotFoundError: If task file is not found
             ValueError: If rendering or validation fails
         """
-        task_path = self.tasks_dir / filename
-
-        if not task_path.exists():
-            raise FileNotFoundError(f"Task file missing: {task_path}")
+        task_path = self._task_paths.get(filename)
+        if task_path is None:
+            task_path = self.tasks_dir / filename
+            self._task_paths[filename] = task_path
 
         # A. Read Raw Content
-        with open(task_path, encoding="utf-8") as f:
-            raw_content = f.read()
+        try:
+            st_before = task_path.stat()
+            raw_bytes = _read_bytes(task_path)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Task file missing: {task_path}")  # noqa: B904
+
+        raw_content = raw_bytes.decode("utf-8")
+        used_digest: bytes | None = hashlib.blake2b(raw_bytes, digest_size=16).digest()
 
         # B. Render Variables (The "Hydration" Step)
         # We wrap vars in a namespace so the user types {{ vars.port }}
-        render_context = {"vars": context}
+        # Task files without any Jinja markers skip the render entirely
+        # and parse through the YAML cache; their output cannot depend on
+        # the render context, so the parsed form is safe to memoize.
+        if _JINJA_RE.search(raw_content) is None:
+            # An untemplated file that already passed validation unchanged
+            # can be returned without re-parsing or re-validating.
+            model_mtime_ns: int | None = st_before.st_mtime_ns
+            cached_entry = self._model_cache.get(task_path)
+            if (
+                cached_entry is not None
+                and cached_entry[0] == model_mtime_ns
+                and isinstance(cached_entry[1], RoutineModel)
+            ):
+                return cached_entry[1], used_digest
 
-        try:
-            template = self.jinja_env.from_string(raw_content)
-            rendered_yaml = template.render(**render_context)
-        except TemplateError as e:
-            raise ValueError(f"Variable Error in {filename}: {e}")  # noqa: B904
+            try:
+                data = self._load_yaml_cached(task_path)
+            except yaml.YAMLError as e:
+                raise ValueError(f"YAML Syntax Error in {filename}: {e}")  # noqa: B904
+        else:
+            # Rendered output depends on the blueprint vars, so it is not
+            # eligible for the validated-model cache.
+            model_mtime_ns = None
 
-        # C. Parse the Rendered YAML
-        try:
-            data = yaml.safe_load(rendered_yaml)
-        except yaml.YAMLError as e:
-            raise ValueError(f"YAML Syntax Error in {filename} after rendering: {e}")  # noqa: B904
+            try:
+                template = self.jinja_env.get_template(filename)
+                rendered_yaml = template.render(vars=context)
+            except TemplateNotFound:
+                raise FileNotFoundError(f"Task file missing: {task_path}")  # noqa: B904
+            except TemplateError as e:
+                raise ValueError(f"Variable Error in {filename}: {e}")  # noqa: B904
+
+            # The loader reads the file on its own, independently of the
+            # raw read above. If the file changed in between, the digest
+            # no longer describes what was actually rendered.
+            try:
+                st_after = task_path.stat()
+            except OSError:
+                used_digest = None
+            else:
+                if (st_after.st_mtime_ns, st_after.st_size) != (
+                    st_before.st_mtime_ns,
+                    st_before.st_size,
+                ):
+                    used_digest = None
+
+            # C. Parse the Rendered YAML
+            try:
+                data = _intern_keys(yaml.load(rendered_yaml, Loader=_SafeLoader))
+            except yaml.YAMLError as e:
+                raise ValueError(  # noqa: B904
+                    f"YAML Syntax Error in {filename} after rendering: {e}"
+                )
 
         if data is None:
             raise ValueError(f"Task file {filename} is empty after rendering")
 
         # D. Validate against Routine Schema
         try:
-            return RoutineModel(**data)
+            routine = RoutineModel(**data)
         except ValidationError as e:
             raise ValueError(f"Task Grammar Error in {filename}:\n{e}")  # noqa: B904
+
+        if model_mtime_ns is not None:
+            self._model_cache[task_path] = (model_mtime_ns, routine)
+
+        return routine, used_digest
@@ -1,6 +1,6 @@
 from typing import Any
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class StepModel(BaseModel):
@@ -24,6 +24,16 @@ class StepModel(BaseModel):
             automatically maps the reserved Python keyword `with` to `with_args`.
     """
 
+    # Steps always arrive from YAML under the `with` alias, never as
+    # `with_args`; declaring alias-only validation lets pydantic-core
+    # skip the field-name fallback lookup for every field of every step.
+    model_config = ConfigDict(
+        frozen=True,
+        extra="forbid",
+        validate_by_alias=True,
+        validate_by_name=False,
+    )
+
     name: str
     uses: str
     ensure: str = "present"  # Default value
@@ -42,6 +52,8 @@ class RoutineModel(BaseModel):
         steps (List[StepModel]): The ordered list of steps to execute.
     """
 
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
     steps: list[StepModel]
 
 
@@ -60,6 +72,8 @@ class TaskRefModel(BaseModel):
             evaluates to True. Defaults to None (always run).
     """
 
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
     file: str
     when: str | None = None
 
@@ -84,6 +98,8 @@ class BlueprintModel(BaseModel):
         run (List[TaskRefModel]): An ordered list of task files to execute.
     """
 
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
     name: str
     target: str
     user: str
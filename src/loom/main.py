@@ -1,7 +1,6 @@
 """Main module for loom application."""
 
 import click
-from blueprint_parser.parser import BlueprintParser
 
 from . import __version__
 
@@ -44,6 +43,10 @@ def run(blueprint: str, project_root: str, dry_run: bool, verbose: bool) -> None
 
     BLUEPRINT: Path to the blueprint YAML file to execute (default: main.yaml).
     """
+    # Imported here so commands that never parse (init, --help) skip the
+    # transitive yaml/jinja2/pydantic import cost at startup.
+    from blueprint_parser.parser import BlueprintParser
+
     try:
         parser = BlueprintParser(project_root)
 
@@ -97,6 +100,8 @@ def validate(blueprint: str, project_root: str) -> None:
 
     BLUEPRINT: Path to the blueprint YAML file to validate (default: main.yaml).
     """
+    from blueprint_parser.parser import BlueprintParser
+
     try:
         parser = BlueprintParser(project_root)
         execution_plan = parser.parse_blueprint(blueprint)
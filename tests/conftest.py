@@ -0,0 +1,19 @@
+"""Shared pytest fixtures."""
+
+from pathlib import Path
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def _isolated_cache_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Point loom's cache directory at a per-test tmp dir.
+
+    The parser writes plan snapshots and Jinja bytecode under the user
+    cache directory (XDG_CACHE_HOME, falling back to ~/.cache). Without
+    isolation, a test run populates the developer's real cache and later
+    runs replay plans from those disk snapshots instead of exercising
+    the parser.
+    """
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))